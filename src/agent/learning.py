@@ -11,7 +11,7 @@ from typing import Any, Dict, List, Optional
 
 from ..config import get_settings
 from ..models.user import ClassificationFeedback, User
-from ..multimodal.client import create_client
+from ..multimodal.client import get_default_async_client
 from ..multimodal.text import chat_completion
 from ..storage import UserStorage
 from .prompts import build_rule_generation_prompt, build_feedback_analysis_prompt
@@ -82,7 +82,7 @@ class FeedbackLearner:
                 deepseek_text_model="",
                 deepseek_base_url=""
             )
-            self._deepseek_client = create_client(settings=deepseek_settings)
+            self._deepseek_client = get_default_async_client(deepseek_settings)
         return self._deepseek_client
     
     async def analyze_feedback(
@@ -225,8 +225,7 @@ class FeedbackLearner:
             self.logger.info(f"已更新用户规则，共{len(existing_rules)}条")
             
             # 清空反馈历史数据
-            feedback_count_before_clear = len(self.user.learning_history.feedbacks)
-            self.user.learning_history.feedbacks.clear()
+            feedback_count_before_clear = self.user.learning_history.clear_feedbacks()
             self.logger.info(f"已清空反馈历史，共清空 {feedback_count_before_clear} 条反馈记录")
             
             return LearningResult(
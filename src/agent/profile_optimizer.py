@@ -14,7 +14,7 @@ from ..config import get_settings
 from ..models import BaseDocument
 from ..models.base import UserCategory
 from ..models.user import User
-from ..multimodal.client import create_client
+from ..multimodal.client import get_default_async_client
 from ..multimodal.text import chat_completion
 from ..storage import UserStorage
 from .prompts import build_profile_optimization_operations_prompt
@@ -77,7 +77,7 @@ class ProfileOptimizer:
                 deepseek_text_model="",
                 deepseek_base_url=""
             )
-            self._deepseek_client = create_client(settings=deepseek_settings)
+            self._deepseek_client = get_default_async_client(deepseek_settings)
         return self._deepseek_client
     
     def should_trigger(
@@ -371,7 +371,7 @@ async def update_document(
             )
         
         # 检查票据是否存在且属于当前用户
-        if document_id not in user.document_ids:
+        if not user.has_document(document_id):
             raise HTTPException(
                 status_code=status.HTTP_404_NOT_FOUND,
                 detail="票据不存在或不属于当前用户"
@@ -507,7 +507,7 @@ async def delete_document(
             )
         
         # 检查票据是否存在且属于当前用户
-        if document_id not in user.document_ids:
+        if not user.has_document(document_id):
             raise HTTPException(
                 status_code=status.HTTP_404_NOT_FOUND,
                 detail="票据不存在或不属于当前用户"
@@ -571,7 +571,7 @@ async def batch_confirm_documents(
         for document_id in request.document_ids:
             try:
                 # 检查票据是否存在且属于当前用户
-                if document_id not in user.document_ids:
+                if not user.has_document(document_id):
                     failed_count += 1
                     continue
                 
@@ -644,7 +644,7 @@ async def confirm_single_document(
             )
         
         # 检查票据是否存在且属于当前用户
-        if document_id not in user.document_ids:
+        if not user.has_document(document_id):
             raise HTTPException(
                 status_code=status.HTTP_404_NOT_FOUND,
                 detail="票据不存在或不属于当前用户"
@@ -718,7 +718,7 @@ async def batch_delete_documents(
         for document_id in request.document_ids:
             try:
                 # 检查票据是否存在且属于当前用户
-                if document_id not in user.document_ids:
+                if not user.has_document(document_id):
                     failed_count += 1
                     continue
                 
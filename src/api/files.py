@@ -59,7 +59,7 @@ async def get_document_file(
             )
         
         # 检查票据是否属于当前用户
-        if document_id not in user.document_ids:
+        if not user.has_document(document_id):
             raise HTTPException(
                 status_code=status.HTTP_404_NOT_FOUND,
                 detail="票据不存在或不属于当前用户"
@@ -7,7 +7,7 @@ from datetime import datetime
 from typing import List, Optional
 
 
-@dataclass
+@dataclass(slots=True)
 class InvoiceItem:
     """发票明细项"""
     item_name: str = ""  # 项目名称
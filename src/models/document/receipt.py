@@ -7,7 +7,7 @@ from datetime import datetime
 from typing import Optional
 
 
-@dataclass
+@dataclass(slots=True)
 class TransferInfo:
     """转账信息"""
     bank_name: str = ""  # 银行名称
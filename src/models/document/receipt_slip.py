@@ -7,7 +7,7 @@ from datetime import datetime
 from typing import List, Optional
 
 
-@dataclass
+@dataclass(slots=True)
 class ReceiptSlipItem:
     """小票明细项"""
     item_name: str = ""  # 商品名称
@@ -3,11 +3,24 @@
 from __future__ import annotations
 
 import json
-from dataclasses import asdict, is_dataclass
+from dataclasses import MISSING, fields, is_dataclass
 from datetime import datetime
 from enum import Enum
 from pathlib import Path
-from typing import Any, Dict, List, Type, TypeVar, Union
+from typing import (
+    Any,
+    Callable,
+    Dict,
+    List,
+    Optional,
+    Tuple,
+    Type,
+    TypeVar,
+    Union,
+    get_args,
+    get_origin,
+    get_type_hints,
+)
 import re
 
 from .base import BaseDocument, DocumentStatus, DocumentType, UserCategory
@@ -28,8 +41,63 @@ from .user import (
     UserProfile,
 )
 
+# 优先使用 orjson，其次 ujson，最后回退到标准库 json
+try:
+    import orjson as _fastjson
+    JSON_BACKEND = "orjson"
+except ImportError:  # pragma: no cover - optional dependency
+    try:
+        import ujson as _fastjson  # type: ignore[no-redef]
+        JSON_BACKEND = "ujson"
+    except ImportError:  # pragma: no cover - optional dependency
+        _fastjson = None  # type: ignore[assignment]
+        JSON_BACKEND = "json"
+
 T = TypeVar("T")
 
+# orjson/ujson 只支持64位整数：超过范围时编码报错、解码会丢失精度（如20位发票号码）。
+# 原始文本中出现19位以上的连续数字时改用标准库解析，保证整数精确。
+_LONG_DIGITS_BYTES = re.compile(rb"\d{19,}")
+_LONG_DIGITS_STR = re.compile(r"\d{19,}")
+
+
+def _public_fields(obj: Any) -> Dict[str, Any]:
+    """浅层读取dataclass的公开字段（跳过以下划线开头的运行时缓存字段）
+    
+    动态属性 structured_data 也一并包含。
+    """
+    result = {
+        f.name: getattr(obj, f.name)
+        for f in fields(obj)
+        if not f.name.startswith("_")
+    }
+    if hasattr(obj, "structured_data"):
+        result["structured_data"] = obj.structured_data
+    return result
+
+
+_PLAIN_TYPES = frozenset({str, int, float, bool, type(None)})
+
+
+def _to_plain(value: Any) -> Any:
+    """递归转换为可直接JSON编码的基础类型"""
+    if type(value) in _PLAIN_TYPES:
+        return value
+    if isinstance(value, Enum):
+        return value.value
+    if isinstance(value, datetime):
+        return value.isoformat()
+    if is_dataclass(value) and not isinstance(value, type):
+        return {key: _to_plain(item) for key, item in _public_fields(value).items()}
+    if isinstance(value, dict):
+        return {
+            (key.value if isinstance(key, Enum) else key): _to_plain(item)
+            for key, item in value.items()
+        }
+    if isinstance(value, (list, tuple, set, frozenset)):
+        return [_to_plain(item) for item in value]
+    return value
+
 
 # ==================== JSON编码器 ====================
 
@@ -42,12 +110,59 @@ class DocumentJSONEncoder(json.JSONEncoder):
         elif isinstance(obj, Enum):
             return obj.value
         elif is_dataclass(obj):
-            return asdict(obj)
+            return _public_fields(obj)
         elif isinstance(obj, set):
             return list(obj)
         return super().default(obj)
 
 
+_encode_default = DocumentJSONEncoder().default
+
+
+def to_json_bytes(obj: Any, indent: Optional[int] = 2) -> bytes:
+    """将对象序列化为UTF-8编码的JSON字节串（按可用后端选择实现）
+    
+    Args:
+        obj: 要序列化的对象
+        indent: 缩进空格数，None 表示紧凑输出
+        
+    Returns:
+        JSON字节串
+    """
+    try:
+        if JSON_BACKEND == "orjson" and indent in (None, 2):
+            option = _fastjson.OPT_PASSTHROUGH_DATACLASS | _fastjson.OPT_NON_STR_KEYS
+            if indent:
+                option |= _fastjson.OPT_INDENT_2
+            return _fastjson.dumps(obj, default=_encode_default, option=option)
+        if JSON_BACKEND == "ujson":
+            if is_dataclass(obj):
+                obj = to_dict(obj)
+            return _fastjson.dumps(
+                obj,
+                default=_encode_default,
+                ensure_ascii=False,
+                escape_forward_slashes=False,
+                indent=indent or 0,
+            ).encode("utf-8")
+    except (TypeError, OverflowError):
+        # 超出64位的整数等快速后端不支持的值，回退到标准库
+        pass
+    return json.dumps(obj, cls=DocumentJSONEncoder, ensure_ascii=False, indent=indent).encode("utf-8")
+
+
+def parse_json(raw: Union[str, bytes]) -> Any:
+    """解析JSON字符串或字节串（按可用后端选择实现）
+    
+    可能包含超出64位整数的内容由标准库解析，避免大整数被转换为浮点数。
+    """
+    if _fastjson is not None:
+        long_digits = _LONG_DIGITS_STR if isinstance(raw, str) else _LONG_DIGITS_BYTES
+        if long_digits.search(raw) is None:
+            return _fastjson.loads(raw)
+    return json.loads(raw)
+
+
 # ==================== 序列化函数 ====================
 
 def to_dict(obj: Any) -> Dict[str, Any]:
@@ -62,22 +177,9 @@ def to_dict(obj: Any) -> Dict[str, Any]:
     if not is_dataclass(obj):
         raise TypeError(f"Expected dataclass, got {type(obj)}")
     
-    result = {}
-    for key, value in asdict(obj).items():
-        if isinstance(value, datetime):
-            result[key] = value.isoformat()
-        elif isinstance(value, Enum):
-            result[key] = value.value
-        elif isinstance(value, set):
-            result[key] = list(value)
-        else:
-            result[key] = value
-    
-    # 包含动态属性（如structured_data）
-    if hasattr(obj, "structured_data"):
-        result["structured_data"] = getattr(obj, "structured_data")
-    
-    return result
+    return {key: _to_plain(value) for key, value in _public_fields(obj).items()}
+
+
 def _normalize_amount_value(value: Any) -> Optional[float]:
     """将金额字符串转换为浮点数"""
     if value is None:
@@ -103,7 +205,7 @@ def _format_date(value: Any) -> Optional[str]:
     if value is None:
         return None
     if isinstance(value, datetime):
-        return value.strftime("%Y/%m/%d")
+        return f"{value.year:04d}/{value.month:02d}/{value.day:02d}"
     if isinstance(value, str):
         cleaned = value.strip()
         if not cleaned:
@@ -124,7 +226,7 @@ def _format_date(value: Any) -> Optional[str]:
         for fmt in candidates:
             try:
                 parsed = datetime.strptime(cleaned, fmt)
-                return parsed.strftime("%Y/%m/%d")
+                return f"{parsed.year:04d}/{parsed.month:02d}/{parsed.day:02d}"
             except ValueError:
                 continue
         digits_match = re.search(r"(20\d{2})(?:[-/年]?)(\d{1,2})(?:[-/月]?)(\d{1,2})", cleaned)
@@ -163,7 +265,7 @@ def to_json(obj: Any, indent: int = 2) -> str:
     Returns:
         JSON字符串
     """
-    return json.dumps(obj, cls=DocumentJSONEncoder, ensure_ascii=False, indent=indent)
+    return to_json_bytes(obj, indent=indent).decode("utf-8")
 
 
 def save_to_file(obj: Any, file_path: Union[str, Path]) -> None:
@@ -176,20 +278,35 @@ def save_to_file(obj: Any, file_path: Union[str, Path]) -> None:
     path = Path(file_path)
     path.parent.mkdir(parents=True, exist_ok=True)
     
-    with path.open("w", encoding="utf-8") as f:
-        json.dump(obj, f, cls=DocumentJSONEncoder, ensure_ascii=False, indent=2)
+    path.write_bytes(to_json_bytes(obj, indent=2))
 
 
 # ==================== 反序列化函数 ====================
 
 def _parse_datetime(value: Any) -> datetime:
     """解析datetime对象"""
+    # JSON 反序列化得到的总是精确的 str，优先走该分支
+    if type(value) is str:
+        return datetime.fromisoformat(value)
     if isinstance(value, datetime):
         return value
-    elif isinstance(value, str):
+    if isinstance(value, str):
         return datetime.fromisoformat(value)
-    else:
-        raise ValueError(f"Cannot parse datetime from {type(value)}")
+    raise ValueError(f"Cannot parse datetime from {type(value)}")
+
+
+# 枚举类型 -> {值/名称: 成员}，值优先于名称
+_ENUM_VALUE_CACHE: Dict[Type[Enum], Dict[str, Enum]] = {}
+
+
+def _enum_lookup(enum_class: Type[Enum]) -> Dict[str, Enum]:
+    """获取枚举的查找表（首次调用时构建）"""
+    lookup = _ENUM_VALUE_CACHE.get(enum_class)
+    if lookup is None:
+        lookup = {member.name: member for member in enum_class}
+        lookup.update({member.value: member for member in enum_class})
+        _ENUM_VALUE_CACHE[enum_class] = lookup
+    return lookup
 
 
 def _parse_enum(enum_class: Type[Enum], value: Any) -> Enum:
@@ -197,198 +314,159 @@ def _parse_enum(enum_class: Type[Enum], value: Any) -> Enum:
     if isinstance(value, enum_class):
         return value
     elif isinstance(value, str):
-        # 尝试按值匹配
-        for member in enum_class:
-            if member.value == value:
-                return member
-        # 尝试按名称匹配
+        # 按值匹配，其次按名称匹配
+        member = _enum_lookup(enum_class).get(value)
+        if member is not None:
+            return member
         return enum_class[value]
     else:
         raise ValueError(f"Cannot parse {enum_class.__name__} from {value}")
 
 
+# ==================== 基于字段元数据的通用构建 ====================
+
+# dataclass -> [(字段名, 类型转换函数或None, 缺省值, 缺省工厂或None)]
+_SCHEMA_CACHE: Dict[type, List[Tuple[str, Optional[Callable[[Any], Any]], Any, Optional[Callable[[], Any]]]]] = {}
+
+
+def _coercer_for(annotation: Any) -> Optional[Callable[[Any], Any]]:
+    """根据字段类型注解生成转换函数，None 表示原样透传"""
+    origin = get_origin(annotation)
+    if origin is Union:
+        args = [arg for arg in get_args(annotation) if arg is not type(None)]
+        if len(args) == 1:
+            inner = _coercer_for(args[0])
+            if inner is None:
+                return None
+            return lambda value: inner(value) if value else None
+        return None
+    if origin is list:
+        (item_type,) = get_args(annotation) or (Any,)
+        if is_dataclass(item_type):
+            return lambda values: [_build_dataclass(item_type, item) for item in values or ()]
+        return None
+    if annotation is datetime:
+        return lambda value: _parse_datetime(value) if value else None
+    if isinstance(annotation, type) and issubclass(annotation, Enum):
+        return lambda value: _parse_enum(annotation, value) if value else None
+    if annotation is float:
+        return float
+    if annotation is bool:
+        return bool
+    if is_dataclass(annotation):
+        return lambda value: _build_dataclass(annotation, value)
+    return None
+
+
+def _compile_schema(cls: type) -> List[Tuple[str, Optional[Callable[[Any], Any]], Any, Optional[Callable[[], Any]]]]:
+    """读取 dataclass 字段元数据并缓存转换规则（每个类型只解析一次）"""
+    schema = _SCHEMA_CACHE.get(cls)
+    if schema is not None:
+        return schema
+    
+    hints = get_type_hints(cls)
+    schema = []
+    for f in fields(cls):
+        if not f.init:
+            continue
+        factory = f.default_factory if f.default_factory is not MISSING else None
+        default = f.default if f.default is not MISSING else None
+        schema.append((f.name, _coercer_for(hints[f.name]), default, factory))
+    _SCHEMA_CACHE[cls] = schema
+    return schema
+
+
+def _build_dataclass(cls: Type[T], data: Dict[str, Any]) -> T:
+    """按缓存的字段规则从字典构建 dataclass，缺失字段使用 dataclass 默认值"""
+    kwargs: Dict[str, Any] = {}
+    for name, coerce, default, factory in _compile_schema(cls):
+        if name in data:
+            value = data[name]
+            kwargs[name] = coerce(value) if coerce is not None else value
+        else:
+            kwargs[name] = factory() if factory is not None else default
+    return cls(**kwargs)
+
+
 def from_dict_invoice_item(data: Dict[str, Any]) -> InvoiceItem:
     """从字典创建InvoiceItem对象"""
-    return InvoiceItem(
-        item_name=data.get("item_name", ""),
-        specification=data.get("specification", ""),
-        unit=data.get("unit", ""),
-        quantity=float(data.get("quantity", 0.0)),
-        price_per_unit=float(data.get("price_per_unit", 0.0)),
-        amount_excluding_tax=float(data.get("amount_excluding_tax", 0.0)),
-        tax_rate=float(data.get("tax_rate", 0.0)),
-        tax_amount=float(data.get("tax_amount", 0.0)),
-    )
+    return _build_dataclass(InvoiceItem, data)
 
 
 def from_dict_invoice(data: Dict[str, Any]) -> Invoice:
     """从字典创建Invoice对象"""
-    items = [from_dict_invoice_item(item) for item in data.get("items", [])]
-    
-    issue_date = None
-    if data.get("issue_date"):
-        issue_date = _parse_datetime(data["issue_date"])
-    
-    return Invoice(
-        invoice_code=data.get("invoice_code", ""),
-        invoice_number=data.get("invoice_number", ""),
-        issue_date=issue_date,
-        buyer_name=data.get("buyer_name", ""),
-        buyer_tax_id=data.get("buyer_tax_id", ""),
-        buyer_address_phone=data.get("buyer_address_phone", ""),
-        buyer_bank_account=data.get("buyer_bank_account", ""),
-        seller_name=data.get("seller_name", ""),
-        seller_tax_id=data.get("seller_tax_id", ""),
-        seller_address_phone=data.get("seller_address_phone", ""),
-        seller_bank_account=data.get("seller_bank_account", ""),
-        total_amount_excluding_tax=float(data.get("total_amount_excluding_tax", 0.0)),
-        total_tax_amount=float(data.get("total_tax_amount", 0.0)),
-        total_amount_including_tax=float(data.get("total_amount_including_tax", 0.0)),
-        currency=data.get("currency", "CNY"),
-        invoice_type=data.get("invoice_type", ""),
-        invoice_status=data.get("invoice_status", "正常"),
-        check_code=data.get("check_code", ""),
-        items=items,
-        payment_method=data.get("payment_method", ""),
-        remark=data.get("remark", ""),
-    )
+    return _build_dataclass(Invoice, data)
 
 
 def from_dict_itinerary(data: Dict[str, Any]) -> Itinerary:
     """从字典创建Itinerary对象"""
-    departure_datetime = None
-    if data.get("departure_datetime"):
-        departure_datetime = _parse_datetime(data["departure_datetime"])
-    
-    arrival_datetime = None
-    if data.get("arrival_datetime"):
-        arrival_datetime = _parse_datetime(data["arrival_datetime"])
-    
-    return Itinerary(
-        transport_type=data.get("transport_type", ""),
-        ticket_number=data.get("ticket_number", ""),
-        passenger_name=data.get("passenger_name", ""),
-        id_card_number=data.get("id_card_number", ""),
-        departure_station=data.get("departure_station", ""),
-        arrival_station=data.get("arrival_station", ""),
-        departure_datetime=departure_datetime,
-        arrival_datetime=arrival_datetime,
-        flight_train_number=data.get("flight_train_number", ""),
-        seat_class=data.get("seat_class", ""),
-        seat_number=data.get("seat_number", ""),
-        base_fare=float(data.get("base_fare", 0.0)),
-        fuel_surcharge=float(data.get("fuel_surcharge", 0.0)),
-        airport_railway_fee=float(data.get("airport_railway_fee", 0.0)),
-        insurance_fee=float(data.get("insurance_fee", 0.0)),
-        total_amount=float(data.get("total_amount", 0.0)),
-        payment_method=data.get("payment_method", ""),
-    )
+    return _build_dataclass(Itinerary, data)
 
 
 def from_dict_receipt_slip_item(data: Dict[str, Any]) -> ReceiptSlipItem:
     """从字典创建ReceiptSlipItem对象"""
-    return ReceiptSlipItem(
-        item_name=data.get("item_name", ""),
-        quantity=float(data.get("quantity", 1.0)),
-        unit_price=float(data.get("unit_price", 0.0)),
-        category_hint=data.get("category_hint", ""),
-    )
+    return _build_dataclass(ReceiptSlipItem, data)
 
 
 def from_dict_receipt_slip(data: Dict[str, Any]) -> ReceiptSlip:
     """从字典创建ReceiptSlip对象"""
-    items = [from_dict_receipt_slip_item(item) for item in data.get("items", [])]
-    
-    transaction_datetime = None
-    if data.get("transaction_datetime"):
-        transaction_datetime = _parse_datetime(data["transaction_datetime"])
-    
-    return ReceiptSlip(
-        merchant_name=data.get("merchant_name", ""),
-        store_location=data.get("store_location", ""),
-        terminal_id=data.get("terminal_id", ""),
-        cashier_id=data.get("cashier_id", ""),
-        transaction_datetime=transaction_datetime,
-        transaction_id=data.get("transaction_id", ""),
-        payment_method=data.get("payment_method", ""),
-        total_amount=float(data.get("total_amount", 0.0)),
-        items=items,
-    )
+    return _build_dataclass(ReceiptSlip, data)
 
 
 def from_dict_transfer_info(data: Dict[str, Any]) -> TransferInfo:
     """从字典创建TransferInfo对象"""
-    return TransferInfo(
-        bank_name=data.get("bank_name", ""),
-        account_from=data.get("account_from", ""),
-        account_to=data.get("account_to", ""),
-        transaction_id=data.get("transaction_id", ""),
-    )
+    return _build_dataclass(TransferInfo, data)
 
 
 def from_dict_receipt(data: Dict[str, Any]) -> Receipt:
     """从字典创建Receipt对象"""
-    issue_date = None
-    if data.get("issue_date"):
-        issue_date = _parse_datetime(data["issue_date"])
-    
-    transfer_info = None
-    if data.get("transfer_info"):
-        transfer_info = from_dict_transfer_info(data["transfer_info"])
-    
-    return Receipt(
-        title=data.get("title", "收据"),
-        receipt_number=data.get("receipt_number", ""),
-        issue_date=issue_date,
-        payer_name=data.get("payer_name", ""),
-        payee_name=data.get("payee_name", ""),
-        amount_in_words=data.get("amount_in_words", ""),
-        amount_in_digits=float(data.get("amount_in_digits", 0.0)),
-        currency=data.get("currency", "CNY"),
-        reason=data.get("reason", ""),
-        payment_method=data.get("payment_method", ""),
-        transfer_info=transfer_info,
-        witness_name=data.get("witness_name", ""),
-        is_official=bool(data.get("is_official", False)),
-        notes=data.get("notes", ""),
-    )
+    return _build_dataclass(Receipt, data)
+
+
+# 结构化数据中的金额字段（按优先级）
+_AMOUNT_FALLBACK_KEYS = (
+    "total_amount",
+    "total_amount_including_tax",
+    "total_amount_excluding_tax",
+    "amount_in_digits",
+)
 
 
 def from_dict_base_document(data: Dict[str, Any]) -> BaseDocument:
     """从字典创建BaseDocument对象"""
     upload_time = datetime.now()
-    if data.get("upload_time"):
-        upload_time = _parse_datetime(data["upload_time"])
+    if value := data.get("upload_time"):
+        upload_time = _parse_datetime(value)
     
     document_type = DocumentType.RECEIPT_SLIP
-    if data.get("document_type"):
-        document_type = _parse_enum(DocumentType, data["document_type"])
+    if value := data.get("document_type"):
+        document_type = _parse_enum(DocumentType, value)
     
     status = None
-    if data.get("status"):
-        status = _parse_enum(DocumentStatus, data["status"])
+    if value := data.get("status"):
+        status = _parse_enum(DocumentStatus, value)
     
     user_category = None
-    if data.get("user_category"):
-        user_category = _parse_enum(UserCategory, data["user_category"])
+    if value := data.get("user_category"):
+        user_category = _parse_enum(UserCategory, value)
     
     amount = None
-    if "amount" in data and data["amount"] not in (None, ""):
-        amount = _normalize_amount_value(data["amount"])
-    if amount is None and "structured_data" in data and isinstance(data["structured_data"], dict):
-        for key in (
-            "total_amount",
-            "total_amount_including_tax",
-            "total_amount_excluding_tax",
-            "amount_in_digits",
-        ):
-            amount = _normalize_amount_value(data["structured_data"].get(key))
+    raw_amount = data.get("amount")
+    if raw_amount not in (None, ""):
+        amount = _normalize_amount_value(raw_amount)
+    structured_data = data.get("structured_data")
+    if amount is None and isinstance(structured_data, dict):
+        for key in _AMOUNT_FALLBACK_KEYS:
+            value = structured_data.get(key)
+            if value is None or value == "":
+                continue
+            amount = _normalize_amount_value(value)
             if amount is not None:
                 break
     
     issued_date = None
-    if data.get("issued_date"):
-        issued_date = _format_date(data["issued_date"])
+    if value := data.get("issued_date"):
+        issued_date = _format_date(value)
 
     doc = BaseDocument(
         document_id=data.get("document_id", ""),
@@ -399,7 +477,7 @@ def from_dict_base_document(data: Dict[str, Any]) -> BaseDocument:
         ocr_text=data.get("ocr_text"),
         status=status,
         user_category=user_category,
-        tags=data.get("tags", []),
+        tags=list(data.get("tags") or ()),
         amount=amount,
         issued_date=issued_date,
         document_type_reasoning=data.get("document_type_reasoning"),
@@ -408,7 +486,7 @@ def from_dict_base_document(data: Dict[str, Any]) -> BaseDocument:
     
     # 恢复结构化数据（动态属性）
     if "structured_data" in data:
-        doc.structured_data = data["structured_data"]  # type: ignore[attr-defined]
+        doc.structured_data = _to_plain(data["structured_data"])  # type: ignore[attr-defined]
         if doc.issued_date is None and isinstance(doc.structured_data, dict):
             doc.issued_date = _extract_structured_date(doc.structured_data, document_type)
 
@@ -417,19 +495,15 @@ def from_dict_base_document(data: Dict[str, Any]) -> BaseDocument:
 
 def from_dict_category_template(data: Dict[str, Any]) -> UserCategoryTemplate:
     """从字典创建UserCategoryTemplate对象"""
-    user_id = data.get("user_id", "")
-    category_tags = {}
-    
-    if data.get("category_tags"):
-        for cat_name, tags in data["category_tags"].items():
-            try:
-                category = _parse_enum(UserCategory, cat_name)
-                category_tags[category] = set(tags) if isinstance(tags, list) else tags
-            except (KeyError, ValueError):
-                continue
+    lookup = _enum_lookup(UserCategory)
+    category_tags = {
+        lookup[cat_name]: set(tags)
+        for cat_name, tags in (data.get("category_tags") or {}).items()
+        if cat_name in lookup and isinstance(tags, (list, tuple, set))
+    }
     
     return UserCategoryTemplate(
-        user_id=user_id,
+        user_id=data.get("user_id", ""),
         category_tags=category_tags,
     )
 
@@ -444,15 +518,15 @@ def from_json(json_str: str, target_type: Type[T]) -> T:
     Returns:
         反序列化后的对象
     """
-    data = json.loads(json_str)
+    data = parse_json(json_str)
     return from_dict(data, target_type)
 
 
 def from_dict_classification_feedback(data: Dict[str, Any]) -> ClassificationFeedback:
     """从字典创建ClassificationFeedback对象"""
     timestamp = datetime.now()
-    if data.get("timestamp"):
-        timestamp = _parse_datetime(data["timestamp"])
+    if value := data.get("timestamp"):
+        timestamp = _parse_datetime(value)
     
     return ClassificationFeedback(
         feedback_id=data.get("feedback_id", ""),
@@ -460,22 +534,20 @@ def from_dict_classification_feedback(data: Dict[str, Any]) -> ClassificationFee
         timestamp=timestamp,
         original_category=data.get("original_category", ""),
         original_user_category=data.get("original_user_category"),
-        original_tags=data.get("original_tags", []),
+        original_tags=list(data.get("original_tags") or ()),
         new_category=data.get("new_category", ""),
         new_user_category=data.get("new_user_category"),
-        new_tags=data.get("new_tags", []),
+        new_tags=list(data.get("new_tags") or ()),
         modification_source=data.get("modification_source", "用户手动"),
     )
 
 
 def from_dict_learning_history(data: Dict[str, Any]) -> LearningHistory:
     """从字典创建LearningHistory对象"""
-    feedbacks = []
-    if data.get("feedbacks"):
-        feedbacks = [
-            from_dict_classification_feedback(fb_data) 
-            for fb_data in data["feedbacks"]
-        ]
+    feedbacks = [
+        from_dict_classification_feedback(fb_data) 
+        for fb_data in data.get("feedbacks") or ()
+    ]
     
     return LearningHistory(
         user_id=data.get("user_id", ""),
@@ -486,16 +558,16 @@ def from_dict_learning_history(data: Dict[str, Any]) -> LearningHistory:
 def from_dict_user_profile(data: Dict[str, Any]) -> UserProfile:
     """从字典创建UserProfile对象"""
     created_at = datetime.now()
-    if data.get("created_at"):
-        created_at = _parse_datetime(data["created_at"])
+    if value := data.get("created_at"):
+        created_at = _parse_datetime(value)
     
     updated_at = datetime.now()
-    if data.get("updated_at"):
-        updated_at = _parse_datetime(data["updated_at"])
+    if value := data.get("updated_at"):
+        updated_at = _parse_datetime(value)
     
     return UserProfile(
         user_id=data.get("user_id", ""),
-        profile_text=data.get("profile_text", []),
+        profile_text=list(data.get("profile_text") or ()),
         created_at=created_at,
         updated_at=updated_at,
     )
@@ -508,16 +580,16 @@ def from_dict_user(data: Dict[str, Any]) -> User:
     learning_history = from_dict_learning_history(data.get("learning_history", {}))
     
     created_at = datetime.now()
-    if data.get("created_at"):
-        created_at = _parse_datetime(data["created_at"])
+    if value := data.get("created_at"):
+        created_at = _parse_datetime(value)
     
     return User(
         user_id=data.get("user_id", ""),
         profile=profile,
         category_template=category_template,
         learning_history=learning_history,
-        document_ids=data.get("document_ids", []),
-        settings=data.get("settings", {}),
+        document_ids=list(data.get("document_ids") or ()),
+        settings=_to_plain(data.get("settings") or {}),
         created_at=created_at,
     )
 
@@ -567,8 +639,7 @@ def load_from_file(file_path: Union[str, Path], target_type: Type[T]) -> T:
         加载的对象
     """
     path = Path(file_path)
-    with path.open("r", encoding="utf-8") as f:
-        data = json.load(f)
+    data = parse_json(path.read_bytes())
     return from_dict(data, target_type)
 
 
@@ -659,6 +730,8 @@ __all__ = [
     "DocumentJSONEncoder",
     "to_dict",
     "to_json",
+    "to_json_bytes",
+    "parse_json",
     "save_to_file",
     "from_dict",
     "from_json",
@@ -3,7 +3,7 @@
 from __future__ import annotations
 
 from dataclasses import dataclass, field
-from typing import Dict, List, Optional, Set
+from typing import Dict, List, Optional, Set, Tuple
 
 from ..base import UserCategory
 
@@ -68,7 +68,7 @@ DEFAULT_CATEGORY_TAGS: Dict[UserCategory, List[str]] = {
 }
 
 
-@dataclass
+@dataclass(slots=True)
 class UserCategoryTemplate:
     """用户自定义的分类模板
     
@@ -79,6 +79,14 @@ class UserCategoryTemplate:
     user_id: str = ""
     category_tags: Dict[UserCategory, Set[str]] = field(default_factory=dict)
     
+    # 排序结果缓存（运行时状态，不参与序列化）
+    _sorted_cache: Dict[UserCategory, Tuple[str, ...]] = field(
+        default_factory=dict, init=False, repr=False, compare=False
+    )
+    _dirty: Set[UserCategory] = field(
+        default_factory=set, init=False, repr=False, compare=False
+    )
+    
     def __post_init__(self) -> None:
         """初始化时，如果没有提供分类标签，则使用默认模板"""
         if not self.category_tags:
@@ -86,6 +94,7 @@ class UserCategoryTemplate:
                 category: set(tags) 
                 for category, tags in DEFAULT_CATEGORY_TAGS.items()
             }
+        self._dirty = set(UserCategory)
     
     def add_tag(self, category: UserCategory, tag: str) -> bool:
         """为指定类别添加子标签
@@ -97,13 +106,13 @@ class UserCategoryTemplate:
         Returns:
             True 如果成功添加（标签不存在），False 如果标签已存在
         """
-        if category not in self.category_tags:
-            self.category_tags[category] = set()
-        
-        if tag in self.category_tags[category]:
+        tags = self.category_tags.setdefault(category, set())
+        before = len(tags)
+        tags.add(tag)
+        if len(tags) == before:
             return False
         
-        self.category_tags[category].add(tag)
+        self._dirty.add(category)
         return True
     
     def remove_tag(self, category: UserCategory, tag: str) -> bool:
@@ -116,13 +125,12 @@ class UserCategoryTemplate:
         Returns:
             True 如果成功移除，False 如果标签不存在
         """
-        if category not in self.category_tags:
+        tags = self.category_tags.get(category)
+        if tags is None or tag not in tags:
             return False
         
-        if tag not in self.category_tags[category]:
-            return False
-        
-        self.category_tags[category].remove(tag)
+        tags.discard(tag)
+        self._dirty.add(category)
         return True
     
     def get_tags(self, category: UserCategory) -> List[str]:
@@ -134,9 +142,10 @@ class UserCategoryTemplate:
         Returns:
             该类别下的所有标签列表（按字母排序）
         """
-        if category not in self.category_tags:
-            return []
-        return sorted(self.category_tags[category])
+        if category in self._dirty:
+            self._sorted_cache[category] = tuple(sorted(self.category_tags.get(category, ())))
+            self._dirty.discard(category)
+        return list(self._sorted_cache.get(category, ()))
     
     def has_tag(self, category: UserCategory, tag: str) -> bool:
         """检查指定类别是否包含某个标签
@@ -185,6 +194,7 @@ class UserCategoryTemplate:
         
         self.category_tags[category].remove(old_tag)
         self.category_tags[category].add(new_tag)
+        self._dirty.add(category)
         return True
     
     def reset_to_default(self, category: Optional[UserCategory] = None) -> None:
@@ -196,11 +206,13 @@ class UserCategoryTemplate:
         if category is not None:
             if category in DEFAULT_CATEGORY_TAGS:
                 self.category_tags[category] = set(DEFAULT_CATEGORY_TAGS[category])
+                self._dirty.add(category)
         else:
             self.category_tags = {
                 cat: set(tags) 
                 for cat, tags in DEFAULT_CATEGORY_TAGS.items()
             }
+            self._dirty = set(UserCategory)
 
 
 def create_default_template(user_id: str) -> UserCategoryTemplate:
@@ -2,21 +2,75 @@
 
 from __future__ import annotations
 
+import os
+import time
+from bisect import bisect_left, bisect_right
 from collections import Counter, defaultdict
 from dataclasses import dataclass, field
 from datetime import datetime, timedelta
-from typing import Dict, List, Optional, Tuple
-from uuid import uuid4
+from itertools import chain
+from operator import attrgetter
+from typing import Any, Dict, FrozenSet, List, Optional, Tuple
+from uuid import UUID
 
 
-@dataclass
+def _uuid7() -> str:
+    """生成 UUIDv7 字符串
+    
+    高48位为毫秒级 Unix 时间戳，其余为随机位，按生成时间大致有序，
+    作为数据库主键时写入局部性优于完全随机的 uuid4。
+    """
+    value = (time.time_ns() // 1_000_000) << 80
+    value |= int.from_bytes(os.urandom(10), "big") & ((1 << 80) - 1)
+    value = (value & ~(0xF << 76)) | (0x7 << 76)  # version 7
+    value = (value & ~(0x3 << 62)) | (0x2 << 62)  # variant RFC 4122
+    return str(UUID(int=value))
+
+
+def _require_pandas() -> Any:
+    """按需导入 pandas（可选依赖，仅批量分析时使用）"""
+    try:
+        import pandas as pd
+    except ImportError as exc:  # pragma: no cover - 运行时缺少依赖
+        raise RuntimeError(
+            "未安装 pandas 库，请先执行 `pip install pandas`。"
+        ) from exc
+    return pd
+
+
+# to_dataframe 的列顺序
+_FRAME_COLUMNS = (
+    "feedback_id",
+    "document_id",
+    "timestamp",
+    "original_user_category",
+    "new_user_category",
+    "tags",
+    "source",
+)
+
+
+def _feedback_row(fb: ClassificationFeedback) -> Dict[str, Any]:
+    """将反馈转换为 DataFrame 的一行"""
+    return {
+        "feedback_id": fb.feedback_id,
+        "document_id": fb.document_id,
+        "timestamp": fb.timestamp,
+        "original_user_category": fb.original_user_category,
+        "new_user_category": fb.new_user_category,
+        "tags": fb.new_tags,
+        "source": fb.modification_source,
+    }
+
+
+@dataclass(slots=True)
 class ClassificationFeedback:
     """分类反馈记录
     
     记录用户对票据分类的修改，用于学习用户的分类习惯和偏好。
     """
     
-    feedback_id: str = field(default_factory=lambda: str(uuid4()))
+    feedback_id: str = field(default_factory=_uuid7)
     document_id: str = ""  # 票据ID
     timestamp: datetime = field(default_factory=datetime.now)  # 修改时间
     
@@ -33,6 +87,15 @@ class ClassificationFeedback:
     # 修改来源
     modification_source: str = "用户手动"  # 用户手动 | AI建议
     
+    # 标签集合缓存（运行时状态，不参与序列化）
+    _orig_tag_set: FrozenSet[str] = field(default=frozenset(), init=False, repr=False, compare=False)
+    _new_tag_set: FrozenSet[str] = field(default=frozenset(), init=False, repr=False, compare=False)
+    
+    def __post_init__(self) -> None:
+        """缓存标签集合，用于快速比较"""
+        self._orig_tag_set = frozenset(self.original_tags)
+        self._new_tag_set = frozenset(self.new_tags)
+    
     def is_category_changed(self) -> bool:
         """专业分类是否改变"""
         return self.original_category != self.new_category
@@ -43,18 +106,18 @@ class ClassificationFeedback:
     
     def is_tags_changed(self) -> bool:
         """标签是否改变"""
-        return set(self.original_tags) != set(self.new_tags)
+        return self._orig_tag_set != self._new_tag_set
     
     def get_added_tags(self) -> List[str]:
         """获取新增的标签"""
-        return [tag for tag in self.new_tags if tag not in self.original_tags]
+        return [tag for tag in self.new_tags if tag not in self._orig_tag_set]
     
     def get_removed_tags(self) -> List[str]:
         """获取移除的标签"""
-        return [tag for tag in self.original_tags if tag not in self.new_tags]
+        return [tag for tag in self.original_tags if tag not in self._new_tag_set]
 
 
-@dataclass
+@dataclass(slots=True)
 class LearningHistory:
     """学习历史
     
@@ -64,6 +127,55 @@ class LearningHistory:
     user_id: str
     feedbacks: List[ClassificationFeedback] = field(default_factory=list)
     
+    # 全量统计的增量聚合（运行时状态，不参与序列化）
+    _tag_counter: Counter = field(default_factory=Counter, init=False, repr=False, compare=False)
+    _source_counter: Counter = field(default_factory=Counter, init=False, repr=False, compare=False)
+    _pattern_counter: Counter = field(default_factory=Counter, init=False, repr=False, compare=False)
+    _category_tag_counter: Dict[Optional[str], Counter] = field(
+        default_factory=lambda: defaultdict(Counter), init=False, repr=False, compare=False
+    )
+    _counted: int = field(default=0, init=False, repr=False, compare=False)
+    # 与 feedbacks 一一对应的时间戳（升序），用于二分查找时间窗口
+    _timestamps: List[datetime] = field(default_factory=list, init=False, repr=False, compare=False)
+    # 列式 DataFrame 缓存及尚未合并的新增行（仅在使用 pandas 分析时构建）
+    _frame: Any = field(default=None, init=False, repr=False, compare=False)
+    _frame_pending: List[Dict[str, Any]] = field(default_factory=list, init=False, repr=False, compare=False)
+    
+    def __post_init__(self) -> None:
+        """根据已有反馈构建聚合统计和时间索引"""
+        self._rebuild_aggregates()
+    
+    def _count_feedback(self, fb: ClassificationFeedback) -> None:
+        """将单条反馈累加到聚合统计中"""
+        self._tag_counter.update(fb.new_tags)
+        self._source_counter[fb.modification_source] += 1
+        if fb.is_user_category_changed() and fb.original_user_category and fb.new_user_category:
+            self._pattern_counter[(fb.original_user_category, fb.new_user_category)] += 1
+        self._category_tag_counter[fb.new_user_category].update(fb.new_tags)
+        self._counted += 1
+    
+    def _rebuild_aggregates(self) -> None:
+        """从头重建聚合统计和时间索引"""
+        timestamps = [fb.timestamp for fb in self.feedbacks]
+        if any(earlier > later for earlier, later in zip(timestamps, timestamps[1:])):
+            self.feedbacks.sort(key=attrgetter("timestamp"))
+            timestamps.sort()
+        self._timestamps = timestamps
+        self._tag_counter = Counter()
+        self._source_counter = Counter()
+        self._pattern_counter = Counter()
+        self._category_tag_counter = defaultdict(Counter)
+        self._counted = 0
+        self._frame = None
+        self._frame_pending = []
+        for fb in self.feedbacks:
+            self._count_feedback(fb)
+    
+    def _ensure_aggregates(self) -> None:
+        """feedbacks 被外部直接修改时重建聚合统计和时间索引"""
+        if self._counted != len(self.feedbacks) or len(self._timestamps) != len(self.feedbacks):
+            self._rebuild_aggregates()
+    
     def add_feedback(
         self,
         document_id: str,
@@ -90,9 +202,31 @@ class LearningHistory:
             new_tags=new_tags,
             modification_source=modification_source
         )
-        self.feedbacks.append(feedback)
+        self._ensure_aggregates()
+        # 通常直接追加在末尾；系统时钟回拨时插入到对应位置以保持时间有序
+        index = bisect_right(self._timestamps, feedback.timestamp)
+        self._timestamps.insert(index, feedback.timestamp)
+        self.feedbacks.insert(index, feedback)
+        self._count_feedback(feedback)
+        if self._frame is not None:
+            if index == len(self.feedbacks) - 1:
+                self._frame_pending.append(_feedback_row(feedback))
+            else:
+                self._frame = None
+                self._frame_pending = []
         return feedback.feedback_id
     
+    def clear_feedbacks(self) -> int:
+        """清空所有反馈
+        
+        Returns:
+            清空的反馈数量
+        """
+        count = len(self.feedbacks)
+        self.feedbacks.clear()
+        self._rebuild_aggregates()
+        return count
+    
     def get_recent_feedbacks(self, days: int = 30) -> List[ClassificationFeedback]:
         """获取最近N天的反馈
         
@@ -102,11 +236,9 @@ class LearningHistory:
         Returns:
             反馈列表
         """
+        self._ensure_aggregates()
         cutoff_time = datetime.now() - timedelta(days=days)
-        return [
-            fb for fb in self.feedbacks 
-            if fb.timestamp >= cutoff_time
-        ]
+        return self.feedbacks[bisect_left(self._timestamps, cutoff_time):]
     
     def get_tag_usage_stats(self, days: Optional[int] = None) -> Dict[str, int]:
         """统计标签使用频率
@@ -117,13 +249,12 @@ class LearningHistory:
         Returns:
             标签到使用次数的映射
         """
-        feedbacks = self.get_recent_feedbacks(days) if days else self.feedbacks
-        
-        tag_counter = Counter()
-        for fb in feedbacks:
-            tag_counter.update(fb.new_tags)
+        if not days:
+            self._ensure_aggregates()
+            return dict(self._tag_counter)
         
-        return dict(tag_counter)
+        feedbacks = self.get_recent_feedbacks(days)
+        return dict(Counter(chain.from_iterable(fb.new_tags for fb in feedbacks)))
     
     def get_category_change_patterns(
         self, 
@@ -139,10 +270,12 @@ class LearningHistory:
         Returns:
             (原类别, 新类别) -> 次数的映射
         """
-        feedbacks = self.get_recent_feedbacks(days) if days else self.feedbacks
+        if not days:
+            self._ensure_aggregates()
+            return dict(self._pattern_counter)
         
         pattern_counter = Counter()
-        for fb in feedbacks:
+        for fb in self.get_recent_feedbacks(days):
             if fb.is_user_category_changed() and fb.original_user_category and fb.new_user_category:
                 pattern = (fb.original_user_category, fb.new_user_category)
                 pattern_counter[pattern] += 1
@@ -176,14 +309,15 @@ class LearningHistory:
         Returns:
             标签到使用次数的映射
         """
-        feedbacks = self.get_recent_feedbacks(days) if days else self.feedbacks
-        
-        tag_counter = Counter()
-        for fb in feedbacks:
-            if fb.new_user_category == user_category:
-                tag_counter.update(fb.new_tags)
+        if not days:
+            self._ensure_aggregates()
+            return dict(self._category_tag_counter.get(user_category, {}))
         
-        return dict(tag_counter)
+        feedbacks = self.get_recent_feedbacks(days)
+        return dict(Counter(chain.from_iterable(
+            fb.new_tags for fb in feedbacks
+            if fb.new_user_category == user_category
+        )))
     
     def get_modification_source_stats(self, days: Optional[int] = None) -> Dict[str, int]:
         """统计修改来源分布
@@ -194,9 +328,11 @@ class LearningHistory:
         Returns:
             修改来源到次数的映射
         """
-        feedbacks = self.get_recent_feedbacks(days) if days else self.feedbacks
+        if not days:
+            self._ensure_aggregates()
+            return dict(self._source_counter)
         
-        source_counter = Counter(fb.modification_source for fb in feedbacks)
+        source_counter = Counter(fb.modification_source for fb in self.get_recent_feedbacks(days))
         return dict(source_counter)
     
     def get_feedback_count(self) -> int:
@@ -214,21 +350,92 @@ class LearningHistory:
         """
         recent_feedbacks = self.get_recent_feedbacks(days)
         
+        # 单次遍历同时累计所有统计项
+        tag_counter = Counter()
+        source_counter = Counter()
+        category_changes = 0
+        tag_changes = 0
+        for fb in recent_feedbacks:
+            tag_counter.update(fb.new_tags)
+            source_counter[fb.modification_source] += 1
+            if fb.is_user_category_changed():
+                category_changes += 1
+            if fb.is_tags_changed():
+                tag_changes += 1
+        
         return {
             "total_feedbacks": len(self.feedbacks),
             "recent_feedbacks": len(recent_feedbacks),
             "days": days,
-            "most_used_tags": self.get_most_used_tags(top_n=5, days=days),
-            "modification_sources": self.get_modification_source_stats(days=days),
-            "category_changes": len([
-                fb for fb in recent_feedbacks 
-                if fb.is_user_category_changed()
-            ]),
-            "tag_changes": len([
-                fb for fb in recent_feedbacks 
-                if fb.is_tags_changed()
-            ]),
+            "most_used_tags": tag_counter.most_common(5),
+            "modification_sources": dict(source_counter),
+            "category_changes": category_changes,
+            "tag_changes": tag_changes,
         }
+    
+    def to_dataframe(self) -> Any:
+        """转换为列式 pandas DataFrame，用于批量统计分析
+        
+        结果会被缓存，新增反馈时按批合并，调用方不应原地修改返回值。
+        需要安装 pandas。
+        
+        Returns:
+            每行一条反馈的 DataFrame，列为 feedback_id, document_id, timestamp,
+            original_user_category, new_user_category, tags, source
+        """
+        pd = _require_pandas()
+        self._ensure_aggregates()
+        if self._frame is None:
+            self._frame = pd.DataFrame(
+                [_feedback_row(fb) for fb in self.feedbacks],
+                columns=list(_FRAME_COLUMNS),
+            )
+            self._frame_pending = []
+        elif self._frame_pending:
+            self._frame = pd.concat(
+                [self._frame, pd.DataFrame(self._frame_pending)],
+                ignore_index=True,
+            )
+            self._frame_pending = []
+        return self._frame
+    
+    def _recent_dataframe(self, days: Optional[int]) -> Any:
+        """获取最近N天反馈的 DataFrame，days 为空时返回全部"""
+        df = self.to_dataframe()
+        if not days:
+            return df
+        cutoff_time = datetime.now() - timedelta(days=days)
+        return df[df["timestamp"] >= cutoff_time]
+    
+    def get_tag_usage_stats_df(self, days: Optional[int] = None) -> Any:
+        """基于 pandas 统计标签使用频率（需要安装 pandas）
+        
+        Args:
+            days: 统计最近N天，None表示全部
+            
+        Returns:
+            以标签为索引、使用次数为值的 Series，按次数降序
+        """
+        return self._recent_dataframe(days)["tags"].explode().value_counts()
+    
+    def get_category_change_patterns_df(self, days: Optional[int] = None) -> Any:
+        """基于 pandas 分析分类修改模式（需要安装 pandas）
+        
+        Args:
+            days: 统计最近N天，None表示全部
+            
+        Returns:
+            以 (原类别, 新类别) 为索引、次数为值的 Series
+        """
+        df = self._recent_dataframe(days)
+        original = df["original_user_category"]
+        new = df["new_user_category"]
+        changed = df[
+            original.notna() & new.notna()
+            & (original != "") & (new != "")
+            & (original != new)
+        ]
+        return changed.groupby(["original_user_category", "new_user_category"]).size()
 
 
 __all__ = [
@@ -2,15 +2,16 @@
 
 from __future__ import annotations
 
+from collections import Counter
 from dataclasses import dataclass, field
 from datetime import datetime
-from typing import Any, Dict, List, Optional
+from typing import Any, Dict, List, Optional, Set
 
 from .categories import UserCategoryTemplate, create_default_template
 from .learning import LearningHistory
 
 
-@dataclass
+@dataclass(slots=True)
 class UserProfile:
     """用户画像
     
@@ -23,16 +24,32 @@ class UserProfile:
     created_at: datetime = field(default_factory=datetime.now)
     updated_at: datetime = field(default_factory=datetime.now)
     
+    # 画像条目集合（运行时状态，不参与序列化），用于O(1)判重
+    _profile_set: Set[str] = field(default_factory=set, init=False, repr=False, compare=False)
+    
+    def __post_init__(self) -> None:
+        self._profile_set = set(self.profile_text)
+    
+    def _profile_items(self) -> Set[str]:
+        """获取画像条目集合；profile_text 被外部直接修改时重建"""
+        if len(self._profile_set) != len(self.profile_text):
+            self._profile_set = set(self.profile_text)
+        return self._profile_set
+    
     def add_profile_item(self, item: str) -> None:
         """添加画像条目"""
-        if item and item not in self.profile_text:
+        items = self._profile_items()
+        if item and item not in items:
             self.profile_text.append(item)
+            items.add(item)
             self.updated_at = datetime.now()
     
     def remove_profile_item(self, item: str) -> bool:
         """移除画像条目"""
-        if item in self.profile_text:
+        items = self._profile_items()
+        if item in items:
             self.profile_text.remove(item)
+            items.discard(item)
             self.updated_at = datetime.now()
             return True
         return False
@@ -40,6 +57,7 @@ class UserProfile:
     def update_profile_items(self, items: List[str]) -> None:
         """批量更新画像条目"""
         self.profile_text = items
+        self._profile_set = set(items)
         self.updated_at = datetime.now()
     
     def get_profile_summary(self) -> str:
@@ -49,7 +67,7 @@ class UserProfile:
         return "\n".join(f"- {item}" for item in self.profile_text)
 
 
-@dataclass
+@dataclass(slots=True)
 class User:
     """用户类 - 完整的用户数据模型
     
@@ -65,15 +83,35 @@ class User:
     settings: Dict[str, Any] = field(default_factory=dict)  # 用户设置
     created_at: datetime = field(default_factory=datetime.now)
     
+    # 票据ID集合（运行时状态，不参与序列化），列表保持顺序，集合提供O(1)查找
+    _doc_id_set: Set[str] = field(default_factory=set, init=False, repr=False, compare=False)
+    
+    def __post_init__(self) -> None:
+        self._doc_id_set = set(self.document_ids)
+    
+    def _document_id_set(self) -> Set[str]:
+        """获取票据ID集合；document_ids 被外部直接修改时重建"""
+        if len(self._doc_id_set) != len(self.document_ids):
+            self._doc_id_set = set(self.document_ids)
+        return self._doc_id_set
+    
+    def has_document(self, doc_id: str) -> bool:
+        """检查是否引用了指定票据"""
+        return doc_id in self._document_id_set()
+    
     def add_document(self, doc_id: str) -> None:
         """添加票据引用"""
-        if doc_id and doc_id not in self.document_ids:
+        doc_ids = self._document_id_set()
+        if doc_id and doc_id not in doc_ids:
             self.document_ids.append(doc_id)
+            doc_ids.add(doc_id)
     
     def remove_document(self, doc_id: str) -> bool:
         """移除票据引用"""
-        if doc_id in self.document_ids:
+        doc_ids = self._document_id_set()
+        if doc_id in doc_ids:
             self.document_ids.remove(doc_id)
+            doc_ids.discard(doc_id)
             return True
         return False
     
@@ -117,22 +155,16 @@ class User:
         # 获取该类别的标签使用统计
         stats = self.learning_history.get_tag_usage_stats()
         
-        # 筛选出该类别的标签
-        category_stats = {
+        # 筛选出该类别的标签（先物化为集合，避免逐个标签线性查找）
+        category_tags = set(self.category_template.get_tags(category))
+        category_stats = Counter({
             tag: count 
             for tag, count in stats.items() 
-            if tag in self.category_template.get_tags(category)
-        }
-        
-        # 按使用次数排序
-        sorted_tags = sorted(
-            category_stats.items(), 
-            key=lambda x: x[1], 
-            reverse=True
-        )
+            if tag in category_tags
+        })
         
-        # 返回前N个
-        return [tag for tag, _ in sorted_tags[:top_n]]
+        # 按使用次数取前N个
+        return [tag for tag, _ in category_stats.most_common(top_n)]
     
     def get_document_count(self) -> int:
         """获取票据总数"""
@@ -4,7 +4,14 @@ from __future__ import annotations
 
 from ..config import Settings, get_settings
 from .audio import encode_audio_to_base64, transcribe, transcribe_audio
-from .client import OpenAIAPIError, create_client, invoke_with_client
+from .client import (
+    OpenAIAPIError,
+    create_async_client,
+    create_client,
+    get_default_async_client,
+    get_default_client,
+    invoke_with_client,
+)
 from .text import chat_completion
 from .vision import analyze_image, encode_image_to_base64, multimodal_completion
 
@@ -12,7 +19,10 @@ __all__ = [
     "Settings",
     "OpenAIAPIError",
     "chat_completion",
+    "create_async_client",
     "create_client",
+    "get_default_async_client",
+    "get_default_client",
     "analyze_image",
     "encode_audio_to_base64",
     "encode_image_to_base64",
@@ -3,12 +3,13 @@
 from __future__ import annotations
 
 import base64
+from contextlib import ExitStack, closing
 from io import BytesIO
 from pathlib import Path
 from typing import Any, Dict, Optional, Union
 
 from ..config import get_settings
-from .client import create_client, invoke_with_client
+from .client import encode_file_to_base64, get_default_async_client, invoke_with_client
 
 def encode_audio_to_base64(audio: Union[str, Path, bytes]) -> str:
     """
@@ -20,10 +21,8 @@ def encode_audio_to_base64(audio: Union[str, Path, bytes]) -> str:
         Path to the audio file or raw audio bytes.
     """
     if isinstance(audio, (str, Path)):
-        data = Path(audio).expanduser().read_bytes()
-    else:
-        data = audio
-    return base64.b64encode(data).decode("utf-8")
+        return encode_file_to_base64(Path(audio).expanduser())
+    return base64.b64encode(audio).decode("utf-8")
 
 
 async def transcribe(
@@ -55,32 +54,30 @@ async def transcribe(
     request_timeout = params.pop("timeout", None)
     resolved_model = model or settings.asr_model
 
-    audio_bytes: bytes
-    resolved_filename: str
-    if isinstance(audio, (str, Path)):
-        audio_path = Path(audio).expanduser()
-        audio_bytes = audio_path.read_bytes()
-        resolved_filename = filename or audio_path.name
-    else:
-        audio_bytes = audio
-        resolved_filename = filename or "audio.wav"
-
-    file_buffer = BytesIO(audio_bytes)
-    file_buffer.name = resolved_filename  # type: ignore[attr-defined]
-
-    request_kwargs: Dict[str, Any] = {
-        "model": resolved_model,
-        "file": file_buffer,
-        **params,
-    }
-    if request_timeout is not None:
-        request_kwargs["timeout"] = request_timeout
-
-    active_client = client or create_client(settings=settings)
-    response = await invoke_with_client(
-        active_client.audio.transcriptions.create,
-        **request_kwargs,
-    )
+    with ExitStack() as stack:
+        file_payload: Any
+        if isinstance(audio, (str, Path)):
+            # 路径输入直接传文件句柄，由 SDK 分块上传，避免整段读入内存
+            audio_path = Path(audio).expanduser()
+            file_handle = stack.enter_context(closing(audio_path.open("rb")))
+            file_payload = (filename or audio_path.name, file_handle)
+        else:
+            file_payload = BytesIO(audio)
+            file_payload.name = filename or "audio.wav"  # type: ignore[attr-defined]
+
+        request_kwargs: Dict[str, Any] = {
+            "model": resolved_model,
+            "file": file_payload,
+            **params,
+        }
+        if request_timeout is not None:
+            request_kwargs["timeout"] = request_timeout
+
+        active_client = client or get_default_async_client(settings)
+        response = await invoke_with_client(
+            active_client.audio.transcriptions.create,
+            **request_kwargs,
+        )
     return response.model_dump()
 
 
@@ -3,13 +3,20 @@
 from __future__ import annotations
 
 import asyncio
+import base64
+import inspect
+import mmap
+import threading
+import weakref
 from dataclasses import dataclass
-from typing import Any, Callable, Optional, TypeVar
+from pathlib import Path
+from typing import Any, Callable, Optional, TypeVar, Union
 
 try:  # pragma: no cover - 导入失败时提供友好提示
-    from openai import OpenAI, OpenAIError
+    from openai import AsyncOpenAI, OpenAI, OpenAIError
 except ImportError as exc:  # pragma: no cover - 运行时缺少依赖
     OpenAI = None  # type: ignore[assignment]
+    AsyncOpenAI = None  # type: ignore[assignment]
 
     class OpenAIError(Exception):
         """缺少 openai 包时的占位异常。"""
@@ -51,19 +58,21 @@ def _wrap_openai_error(exc: OpenAIError) -> OpenAIAPIError:
     return OpenAIAPIError(status=status, message=message, details=details)
 
 
-def create_client(
-    settings: Optional[Settings] = None,
+def _build_client(
+    client_cls: Any,
+    settings: Optional[Settings],
+    base_url: Optional[str],
+    timeout: Optional[float],
     *,
-    base_url: Optional[str] = None,
-    timeout: Optional[float] = None,
-) -> OpenAI:
-    """根据配置初始化同步 OpenAI 客户端。"""
+    use_async: bool,
+) -> Any:
+    """按配置构建 OpenAI / AsyncOpenAI 客户端，并兼容不同 SDK 版本。"""
     settings = settings or get_settings()
     if not settings.has_credentials:
         raise ValueError(
             "ZHIPU_API_KEY 未提供，请在环境变量或 .env 文件中进行配置。"
         )
-    if OpenAI is None:
+    if client_cls is None:
         raise RuntimeError(
             "未安装 openai 库，请先执行 `pip install openai`。"
         ) from _OPENAI_IMPORT_ERROR
@@ -84,7 +93,7 @@ def create_client(
         client_kwargs["timeout"] = resolved_timeout
     
     try:
-        return OpenAI(**client_kwargs)
+        return client_cls(**client_kwargs)
     except TypeError as e:
         error_msg = str(e)
         # 如果出现 proxies 相关的错误，可能是 OpenAI SDK 内部使用了不兼容的参数
@@ -94,8 +103,9 @@ def create_client(
             try:
                 import httpx
                 # 创建一个不包含 proxies 的 httpx 客户端
-                http_client = httpx.Client(timeout=resolved_timeout)
-                return OpenAI(
+                http_client_cls = httpx.AsyncClient if use_async else httpx.Client
+                http_client = http_client_cls(timeout=resolved_timeout)
+                return client_cls(
                     api_key=settings.api_key,
                     base_url=resolved_base_url,
                     http_client=http_client
@@ -107,7 +117,7 @@ def create_client(
                     "base_url": resolved_base_url,
                 }
                 try:
-                    return OpenAI(**minimal_kwargs)
+                    return client_cls(**minimal_kwargs)
                 except TypeError:
                     # 如果还是失败，可能是 OpenAI SDK 版本问题
                     # 建议用户升级或降级 openai 和 httpx 库
@@ -122,6 +132,114 @@ def create_client(
         raise
 
 
+def create_client(
+    settings: Optional[Settings] = None,
+    *,
+    base_url: Optional[str] = None,
+    timeout: Optional[float] = None,
+) -> OpenAI:
+    """根据配置初始化同步 OpenAI 客户端。"""
+    return _build_client(OpenAI, settings, base_url, timeout, use_async=False)
+
+
+def create_async_client(
+    settings: Optional[Settings] = None,
+    *,
+    base_url: Optional[str] = None,
+    timeout: Optional[float] = None,
+) -> AsyncOpenAI:
+    """根据配置初始化异步 AsyncOpenAI 客户端。"""
+    return _build_client(AsyncOpenAI, settings, base_url, timeout, use_async=True)
+
+
+# (api_key, base_url, timeout) -> 共享同步客户端，复用底层 httpx 连接池
+_client_cache: dict[tuple[str, str, float], OpenAI] = {}
+# 异步客户端的连接池绑定事件循环，因此按事件循环分别缓存
+_async_client_cache: weakref.WeakKeyDictionary[
+    asyncio.AbstractEventLoop, dict[tuple[str, str, float], AsyncOpenAI]
+] = weakref.WeakKeyDictionary()
+_client_cache_lock = threading.Lock()
+
+
+def _client_cache_key(settings: Settings) -> tuple[str, str, float]:
+    """客户端缓存键：(api_key, base_url, timeout)。"""
+    return (
+        settings.api_key,
+        _normalise_base_url(settings.base_url),
+        settings.http_timeout,
+    )
+
+
+def get_default_client(settings: Optional[Settings] = None) -> OpenAI:
+    """
+    获取按配置缓存的共享同步客户端，避免每次调用都新建连接池。
+
+    Parameters
+    ----------
+    settings:
+        客户端配置，默认读取环境变量。
+    """
+    settings = settings or get_settings()
+    key = _client_cache_key(settings)
+    with _client_cache_lock:
+        client = _client_cache.get(key)
+        if client is None:
+            client = create_client(settings=settings)
+            _client_cache[key] = client
+    return client
+
+
+def get_default_async_client(
+    settings: Optional[Settings] = None,
+) -> Union[AsyncOpenAI, OpenAI]:
+    """
+    获取按配置缓存的共享异步客户端，供 :func:`invoke_with_client` 直接 await。
+
+    异步客户端的连接池绑定事件循环，因此按当前事件循环分别缓存；
+    不在事件循环中调用时返回 :func:`get_default_client` 的同步客户端。
+
+    Parameters
+    ----------
+    settings:
+        客户端配置，默认读取环境变量。
+    """
+    try:
+        loop = asyncio.get_running_loop()
+    except RuntimeError:
+        return get_default_client(settings)
+
+    settings = settings or get_settings()
+    key = _client_cache_key(settings)
+    with _client_cache_lock:
+        cache = _async_client_cache.setdefault(loop, {})
+        client = cache.get(key)
+        if client is None:
+            client = create_async_client(settings=settings)
+            cache[key] = client
+    return client
+
+
+def encode_file_to_base64(path: Path) -> str:
+    """
+    将文件内容编码为 base64 字符串。
+
+    通过 mmap 让 base64 编码器直接读取页缓存，避免先把整个文件读入
+    一份 ``bytes`` 再编码造成的双份内存占用；空文件等无法映射的情况
+    回退为普通读取。
+    """
+    with path.open("rb") as f:
+        try:
+            with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+                return base64.b64encode(mapped).decode("ascii")
+        except (ValueError, OSError):
+            return base64.b64encode(f.read()).decode("ascii")
+
+
+def _is_async_callable(func: Callable[..., Any]) -> bool:
+    """判断目标方法是否为协程函数（兼容 SDK 中经装饰器包装的方法）。"""
+    return inspect.iscoroutinefunction(inspect.unwrap(func))
+
+
 async def invoke_with_client(
     func: Callable[..., T],
     /,
@@ -129,7 +247,10 @@ async def invoke_with_client(
     **kwargs: Any,
 ) -> T:
     """
-    在线程池中执行同步 OpenAI 请求，并统一异常处理。
+    执行 OpenAI 请求，并统一异常处理。
+
+    ``AsyncOpenAI`` 的方法直接在当前事件循环上等待；同步客户端的方法
+    则放到线程池中执行。
 
     Parameters
     ----------
@@ -138,6 +259,11 @@ async def invoke_with_client(
     args, kwargs:
         透传给目标方法的参数。
     """
+    if _is_async_callable(func):
+        try:
+            return await func(*args, **kwargs)  # type: ignore[misc]
+        except OpenAIError as exc:  # pragma: no cover - 由业务测试覆盖
+            raise _wrap_openai_error(exc) from exc
 
     def _runner() -> T:
         try:
@@ -149,6 +275,16 @@ async def invoke_with_client(
     return await asyncio.to_thread(_runner) if loop.is_running() else _runner()
 
 
-__all__ = ["OpenAI", "OpenAIAPIError", "create_client", "invoke_with_client"]
+__all__ = [
+    "AsyncOpenAI",
+    "OpenAI",
+    "OpenAIAPIError",
+    "create_async_client",
+    "create_client",
+    "encode_file_to_base64",
+    "get_default_async_client",
+    "get_default_client",
+    "invoke_with_client",
+]
 
 
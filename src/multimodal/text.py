@@ -5,7 +5,7 @@ from __future__ import annotations
 from typing import Any, Dict, Iterable, Optional, Union
 
 from ..config import get_settings
-from .client import create_client, invoke_with_client
+from .client import get_default_async_client, invoke_with_client
 
 async def chat_completion(
     messages: Iterable[Dict[str, Any]],
@@ -40,7 +40,7 @@ async def chat_completion(
     settings = get_settings()
     payload: Dict[str, Any] = {
         "model": model or settings.text_model,
-        "messages": list(messages),
+        "messages": messages if isinstance(messages, list) else list(messages),
         "temperature": temperature,
         **params,
     }
@@ -53,7 +53,7 @@ async def chat_completion(
         else:
             raise TypeError("response_format 必须为字符串或字典。")
 
-    active_client = client or create_client(settings=settings)
+    active_client = client or get_default_async_client(settings)
     response = await invoke_with_client(
         active_client.chat.completions.create,
         **payload,
@@ -1,12 +1,38 @@
 """FastAPI application entry point."""
 
 import logging
+import os
+from typing import Any
 
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.middleware.gzip import GZipMiddleware
+from fastapi.responses import JSONResponse, ORJSONResponse
 
 from .api import api_router
 
+try:
+    import orjson  # noqa: F401
+except ImportError:  # pragma: no cover - optional dependency
+    orjson = None
+
+
+class FallbackORJSONResponse(ORJSONResponse):
+    """Render with orjson, falling back to stdlib JSON for values orjson rejects.
+
+    orjson only supports 64-bit integers; long unquoted numbers (e.g. 20-digit
+    invoice numbers in structured_data) are rendered by JSONResponse instead.
+    """
+
+    def render(self, content: Any) -> bytes:
+        try:
+            return super().render(content)
+        except TypeError:
+            return JSONResponse.render(self, content)
+
+
+DefaultResponse = FallbackORJSONResponse if orjson is not None else JSONResponse
+
 # 配置日志
 logging.basicConfig(
     level=logging.INFO,
@@ -14,12 +40,22 @@ logging.basicConfig(
     datefmt='%Y-%m-%d %H:%M:%S'
 )
 
-app = FastAPI(title="Receipt Agent API")
+app = FastAPI(title="Receipt Agent API", default_response_class=DefaultResponse)
+
+# Compress larger JSON responses (document lists, learning statistics)
+app.add_middleware(GZipMiddleware, minimum_size=1000)
+
+# Allow local frontend development by enabling CORS.
+# Set CORS_ALLOW_ORIGINS to a comma-separated list to restrict origins in deployment.
+cors_origins = [
+    origin.strip()
+    for origin in os.getenv("CORS_ALLOW_ORIGINS", "*").split(",")
+    if origin.strip()
+] or ["*"]
 
-# Allow local frontend development by enabling CORS
 app.add_middleware(
     CORSMiddleware,
-    allow_origins=["*"],
+    allow_origins=cors_origins,
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
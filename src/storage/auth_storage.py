@@ -2,10 +2,13 @@
 
 from __future__ import annotations
 
-import json
 import uuid
 from pathlib import Path
-from typing import Dict, List, Optional
+from types import MappingProxyType
+from typing import Dict, List, Mapping, Optional, Tuple
+
+from ..models.serialization import parse_json, to_json_bytes
+from .file_utils import atomic_write_bytes
 
 ACCOUNT_FILE = Path("/data/disk2/zhz/票据管理比赛/data/account.json")
 
@@ -15,21 +18,20 @@ def _ensure_data_dir() -> None:
     ACCOUNT_FILE.parent.mkdir(parents=True, exist_ok=True)
 
 
-def load_accounts() -> List[Dict[str, str]]:
-    """Load all accounts from the JSON file.
+# Parsed accounts cached by file identity: ((st_ino, st_mtime_ns, st_size), accounts, username index)
+_cache: Optional[Tuple[Tuple[int, int, int], List[Dict[str, str]], Dict[str, Dict[str, str]]]] = None
+
+
+def _read_accounts() -> Optional[List[Dict[str, str]]]:
+    """Parse the account file (no caching).
     
     Returns:
-        List of account dicts with keys: username, password, user_id
+        List of accounts, or None if the file could not be read or parsed
     """
-    _ensure_data_dir()
-    if not ACCOUNT_FILE.exists():
-        return []
-
-    with ACCOUNT_FILE.open("r", encoding="utf-8") as f:
-        try:
-            data = json.load(f)
-        except json.JSONDecodeError:
-            return []
+    try:
+        data = parse_json(ACCOUNT_FILE.read_bytes())
+    except (FileNotFoundError, ValueError):
+        return None
 
     if isinstance(data, list):
         # Ensure each entry has username/password/user_id keys
@@ -46,11 +48,55 @@ def load_accounts() -> List[Dict[str, str]]:
     return []
 
 
+def _load_cached() -> Tuple[List[Dict[str, str]], Dict[str, Dict[str, str]]]:
+    """Return parsed accounts and the username index, reparsing only when the file changed."""
+    global _cache
+    try:
+        st = ACCOUNT_FILE.stat()
+    except FileNotFoundError:
+        return [], {}
+    key = (st.st_ino, st.st_mtime_ns, st.st_size)
+
+    if _cache is not None and _cache[0] == key:
+        return _cache[1], _cache[2]
+
+    accounts = _read_accounts()
+    index: Dict[str, Dict[str, str]] = {}
+    if accounts is None:
+        # Do not cache a failed parse; the next call reads the file again
+        return [], index
+    for acc in accounts:
+        index.setdefault(acc["username"], acc)
+    _cache = (key, accounts, index)
+    return accounts, index
+
+
+def load_accounts() -> List[Dict[str, str]]:
+    """Load all accounts from the JSON file.
+    
+    Returns:
+        List of account dicts with keys: username, password, user_id
+    """
+    accounts, _ = _load_cached()
+    return list(accounts)
+
+
+def load_account_index() -> Mapping[str, Dict[str, str]]:
+    """Load all accounts indexed by username.
+    
+    Returns:
+        Read-only mapping of username -> account dict (first entry wins on duplicates)
+    """
+    _, index = _load_cached()
+    return MappingProxyType(index)
+
+
 def save_accounts(accounts: List[Dict[str, str]]) -> None:
     """Persist accounts to the JSON file."""
+    global _cache
     _ensure_data_dir()
-    with ACCOUNT_FILE.open("w", encoding="utf-8") as f:
-        json.dump(accounts, f, ensure_ascii=False, indent=2)
+    atomic_write_bytes(ACCOUNT_FILE, to_json_bytes(accounts, indent=2))
+    _cache = None
 
 
 def find_account(username: str) -> Optional[Dict[str, str]]:
@@ -59,10 +105,7 @@ def find_account(username: str) -> Optional[Dict[str, str]]:
     if not username:
         return None
 
-    for acc in load_accounts():
-        if acc.get("username") == username:
-            return acc
-    return None
+    return load_account_index().get(username)
 
 
 def create_account(username: str, password: str) -> Dict[str, str]:
@@ -82,9 +125,10 @@ def create_account(username: str, password: str) -> Dict[str, str]:
     if not username:
         raise ValueError("Username cannot be empty")
 
-    accounts = load_accounts()
-    if any(acc.get("username") == username for acc in accounts):
+    accounts, index = _load_cached()
+    if username in index:
         raise ValueError("Username already exists")
+    accounts = list(accounts)
 
     # Generate user_id from username
     user_id = f"user_{username}"
@@ -101,9 +145,10 @@ def create_account(username: str, password: str) -> Dict[str, str]:
 
 def ensure_demo_account() -> None:
     """Ensure the demo account (123/123) exists."""
-    accounts = load_accounts()
+    accounts, index = _load_cached()
 
-    if not any(acc.get("username") == "123" for acc in accounts):
+    if "123" not in index:
+        accounts = list(accounts)
         accounts.append({
             "username": "123",
             "password": "123",
@@ -0,0 +1,37 @@
+"""文件写入工具 - 存储模块共用的原子写入"""
+
+from __future__ import annotations
+
+import os
+import threading
+from pathlib import Path
+from typing import Union
+
+
+def atomic_write_bytes(path: Union[str, Path], data: bytes) -> os.stat_result:
+    """原子写入文件：先写同目录临时文件并 fsync，再用 os.replace 替换
+    
+    读取方要么看到旧文件，要么看到完整的新文件，不会读到写了一半的内容。
+    
+    Returns:
+        替换前临时文件的 stat 结果。重命名不改变 inode、大小和修改时间，
+        可直接作为写入内容的缓存校验键；替换后再 stat 可能拿到其他写入方的文件。
+    """
+    tmp_path = f"{os.fspath(path)}.{os.getpid()}.{threading.get_ident()}.tmp"
+    try:
+        with open(tmp_path, "wb") as f:
+            f.write(data)
+            f.flush()
+            os.fsync(f.fileno())
+            st = os.fstat(f.fileno())
+        os.replace(tmp_path, path)
+        return st
+    except BaseException:
+        try:
+            os.unlink(tmp_path)
+        except OSError:
+            pass
+        raise
+
+
+__all__ = ["atomic_write_bytes"]
@@ -2,71 +2,225 @@
 
 from __future__ import annotations
 
-import json
+import hashlib
+import logging
+import os
+import shutil
+import threading
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from itertools import chain
 from pathlib import Path
-from typing import Dict, List, Optional, Union
+from typing import Dict, Iterator, List, Optional, Set, Tuple, Union
+from urllib.parse import quote, unquote
+from uuid import uuid4
+
+try:
+    import ijson
+except ImportError:  # pragma: no cover - optional dependency
+    ijson = None
+
+# 解析旧版 user.json 时可能出现的格式错误
+_USER_FILE_PARSE_ERRORS: Tuple[type, ...] = (ValueError,) if ijson is None else (ValueError, ijson.JSONError)
 
 from ..models import BaseDocument, User
-from ..models.serialization import DocumentJSONEncoder, to_dict, from_dict
+from ..models.serialization import from_dict, parse_json, to_dict, to_json_bytes
 from ..models.user import create_new_user
+from .file_utils import atomic_write_bytes
 
 
 USER_FILE = Path("/data/disk2/zhz/票据管理比赛/data/user.json")
 UPLOADS_DIR = Path("/data/disk2/zhz/票据管理比赛/data/uploads")
 DOCUMENTS_DIR = Path("/data/disk2/zhz/票据管理比赛/data/documents")
 
+# 每个存储实例缓存的票据数量上限
+DOCUMENT_CACHE_SIZE = 512
+
+# 用户文件名（不含扩展名）的最大长度，超出时改用哈希文件名
+_MAX_USER_FILENAME_LENGTH = 200
+# 哈希文件名前缀；quote 总会转义 "#"，因此不会与编码后的普通文件名冲突
+_HASHED_USER_PREFIX = "#"
+
+logger = logging.getLogger(__name__)
+
+# 后台清理线程池（删除用户上传目录等耗时文件操作），所有存储实例共享，首次使用时创建
+_cleanup_pool: Optional[ThreadPoolExecutor] = None
+_cleanup_pool_lock = threading.Lock()
+
+
+def _get_cleanup_pool() -> ThreadPoolExecutor:
+    """获取共享的后台清理线程池"""
+    global _cleanup_pool
+    with _cleanup_pool_lock:
+        if _cleanup_pool is None:
+            _cleanup_pool = ThreadPoolExecutor(max_workers=2, thread_name_prefix="user-storage-cleanup")
+        return _cleanup_pool
+
+
+def _user_filename(user_id: str) -> str:
+    """将用户ID编码为安全的文件名（不含扩展名）
+    
+    用户ID可能包含 "/" 等任意字符，这里做百分号编码；编码后过长时使用哈希，
+    真实用户ID保存在文件内容的 user_id 字段中。
+    """
+    encoded = quote(user_id, safe="")
+    if len(encoded) > _MAX_USER_FILENAME_LENGTH:
+        return _HASHED_USER_PREFIX + hashlib.sha256(user_id.encode("utf-8")).hexdigest()
+    return encoded
+
 
 class UserStorage:
     """用户数据存储管理器
     
     文件结构：
-    - data/user.json - 所有用户数据 {"user_id": {...User对象...}}
+    - data/users/{user_id}.json - 单个用户数据（User对象），文件名为百分号编码后的用户ID
+    - data/documents/{user_id}/{document_id}.json - 用户票据数据
     - data/uploads/{user_id}/ - 用户上传的图片文件
+    
+    旧版本将所有用户保存在 data/user.json 中，首次初始化时会自动迁移为按用户分文件，
+    原文件重命名为 user.json.migrated。
     """
     
-    def __init__(self, user_file: Optional[Path] = None, uploads_dir: Optional[Path] = None, documents_dir: Optional[Path] = None):
+    def __init__(
+        self,
+        user_file: Optional[Path] = None,
+        uploads_dir: Optional[Path] = None,
+        documents_dir: Optional[Path] = None,
+        pretty: bool = False,
+    ):
         """初始化存储管理器
         
         Args:
-            user_file: 用户数据文件路径
+            user_file: 旧版用户数据文件路径，用户目录位于其同级的 users/ 下
             uploads_dir: 上传文件目录
             documents_dir: 文档存储目录
+            pretty: 是否以缩进格式写入JSON（便于人工查看），默认紧凑格式
         """
         self.user_file = user_file or USER_FILE
+        self.users_dir = self.user_file.parent / "users"
         self.uploads_dir = uploads_dir or UPLOADS_DIR
         self.documents_dir = documents_dir or DOCUMENTS_DIR
+        self._indent: Optional[int] = 2 if pretty else None
+        # 用户数据解析结果缓存：user_id -> (文件校验键, 用户数据)，校验键为 (inode, mtime_ns, size)
+        self._users_cache: Dict[str, Tuple[Tuple[int, int, int], Dict]] = {}
+        self._lock = threading.RLock()
+        # 已确认存在的目录，避免每次调用都执行 mkdir
+        self._ensured_dirs: Set[Path] = set()
+        # user_id -> 已确认存在的票据目录字符串路径，供票据读写热路径直接拼接
+        self._user_docs_dir_str: Dict[str, str] = {}
+        # 票据数据LRU缓存：(user_id, document_id) -> (文件校验键, 票据数据)
+        self._doc_cache: OrderedDict[Tuple[str, str], Tuple[Tuple[int, int, int], Dict]] = OrderedDict()
         self._ensure_dirs()
     
     def _ensure_dirs(self) -> None:
-        """确保必要的目录和文件存在"""
-        self.user_file.parent.mkdir(parents=True, exist_ok=True)
+        """确保必要的目录存在，并迁移旧版用户数据文件"""
+        self.users_dir.mkdir(parents=True, exist_ok=True)
         self.uploads_dir.mkdir(parents=True, exist_ok=True)
         self.documents_dir.mkdir(parents=True, exist_ok=True)
         
-        if not self.user_file.exists():
-            # 初始化空的用户数据文件
-            with self.user_file.open("w", encoding="utf-8") as f:
-                json.dump({}, f, ensure_ascii=False, indent=2)
+        if self.user_file.exists():
+            self._migrate_user_file()
     
-    def _load_all_users(self) -> Dict[str, Dict]:
-        """加载所有用户数据"""
-        if not self.user_file.exists():
-            return {}
+    def _ensure_dir(self, path: Path) -> Path:
+        """确保目录存在（同一目录只创建一次）"""
+        if path not in self._ensured_dirs:
+            path.mkdir(parents=True, exist_ok=True)
+            self._ensured_dirs.add(path)
+        return path
+    
+    def _migrate_user_file(self) -> None:
+        """将旧版 user.json 拆分为按用户存储的文件（仅执行一次）"""
+        with self._lock:
+            failed = False
+            try:
+                for user_id, user_data in self._iter_user_file():
+                    user_path = self._user_path(user_id)
+                    # 已存在的按用户文件更新，不被旧数据覆盖
+                    if not isinstance(user_data, dict) or user_path.exists():
+                        continue
+                    try:
+                        atomic_write_bytes(user_path, to_json_bytes(user_data, indent=self._indent))
+                    except OSError as exc:
+                        failed = True
+                        logger.error(f"迁移用户数据失败: {user_id!r}: {exc}")
+            except FileNotFoundError:
+                return
+            except _USER_FILE_PARSE_ERRORS as exc:
+                # 文件损坏（如旧版非原子写入留下的截断文件）：保留原文件，避免丢失其余用户
+                failed = True
+                logger.error(f"解析旧版用户数据文件失败，保留 {self.user_file}: {exc}")
+            
+            if failed:
+                # 保留旧文件，下次启动时重试未迁移成功的用户
+                return
+            
+            try:
+                os.replace(self.user_file, self.user_file.with_name(self.user_file.name + ".migrated"))
+            except FileNotFoundError:
+                pass
+    
+    def _iter_user_file(self) -> Iterator[Tuple[str, Dict]]:
+        """逐个读取旧版 user.json 中的 (user_id, 用户数据)
         
-        with self.user_file.open("r", encoding="utf-8") as f:
+        安装了 ijson 时流式解析，无需把整个文件载入内存；否则整体解析。
+        文件格式错误时抛出 ValueError（或 ijson.JSONError），由调用方处理。
+        """
+        if ijson is None:
+            data = parse_json(self.user_file.read_bytes())
+            if isinstance(data, dict):
+                yield from data.items()
+            return
+        
+        with self.user_file.open("rb") as f:
+            yield from ijson.kvitems(f, "", use_float=True)
+    
+    def _user_path(self, user_id: str) -> Path:
+        """获取单个用户的数据文件路径"""
+        return self.users_dir / f"{_user_filename(user_id)}.json"
+    
+    def _load_user_data(self, user_id: str) -> Optional[Dict]:
+        """加载单个用户的原始数据
+        
+        文件未变化时直接返回缓存；返回的字典为共享缓存，调用方不应修改。
+        """
+        user_path = self._user_path(user_id)
+        with self._lock:
             try:
-                data = json.load(f)
-                return data if isinstance(data, dict) else {}
-            except json.JSONDecodeError:
-                return {}
+                st = user_path.stat()
+            except FileNotFoundError:
+                self._users_cache.pop(user_id, None)
+                return None
+            key = (st.st_ino, st.st_mtime_ns, st.st_size)
+            
+            cached = self._users_cache.get(user_id)
+            if cached is not None and cached[0] == key:
+                return cached[1]
+            
+            try:
+                data = parse_json(user_path.read_bytes())
+            except (FileNotFoundError, ValueError):
+                data = None
+            if not isinstance(data, dict):
+                self._users_cache.pop(user_id, None)
+                return None
+            
+            self._users_cache[user_id] = (key, data)
+            return data
     
-    def _save_all_users(self, users_data: Dict[str, Dict]) -> None:
-        """保存所有用户数据"""
-        with self.user_file.open("w", encoding="utf-8") as f:
-            json.dump(users_data, f, cls=DocumentJSONEncoder, ensure_ascii=False, indent=2)
+    def _save_user_data(self, user_id: str, user_data: Dict) -> None:
+        """保存单个用户的原始数据"""
+        user_path = self._user_path(user_id)
+        with self._lock:
+            self._users_cache.pop(user_id, None)
+            st = atomic_write_bytes(user_path, to_json_bytes(user_data, indent=self._indent))
+            self._users_cache[user_id] = ((st.st_ino, st.st_mtime_ns, st.st_size), user_data)
     
     def get_user_upload_dir(self, user_id: str) -> Path:
-        """获取用户上传文件目录"""
+        """获取用户上传文件目录
+        
+        上传目录可能被任意存储实例的 delete_user 或外部清理删除，因此每次都确认存在，
+        不使用 _ensure_dir 的缓存。
+        """
         user_upload_dir = self.uploads_dir / user_id
         user_upload_dir.mkdir(parents=True, exist_ok=True)
         return user_upload_dir
@@ -77,27 +231,26 @@ class UserStorage:
         Args:
             user: 用户对象
         """
-        all_users = self._load_all_users()
-        user_data = to_dict(user)
-        
-        existing_data = all_users.get(user.user_id)
-        if existing_data is not None:
-            merged_document_ids = self._merge_document_ids(
-                user_id=user.user_id,
-                new_document_ids=user_data.get("document_ids", []),
-                existing_document_ids=existing_data.get("document_ids", []),
-            )
-            user_data["document_ids"] = merged_document_ids
-        else:
-            # 确保新增用户也按照目录里的实际票据顺序保存
-            user_data["document_ids"] = self._merge_document_ids(
-                user_id=user.user_id,
-                new_document_ids=user_data.get("document_ids", []),
-                existing_document_ids=[],
-            )
-        
-        all_users[user.user_id] = user_data
-        self._save_all_users(all_users)
+        with self._lock:
+            user_data = to_dict(user)
+            
+            existing_data = self._load_user_data(user.user_id)
+            if existing_data is not None:
+                merged_document_ids = self._merge_document_ids(
+                    user_id=user.user_id,
+                    new_document_ids=user_data.get("document_ids", []),
+                    existing_document_ids=existing_data.get("document_ids", []),
+                )
+                user_data["document_ids"] = merged_document_ids
+            else:
+                # 确保新增用户也按照目录里的实际票据顺序保存
+                user_data["document_ids"] = self._merge_document_ids(
+                    user_id=user.user_id,
+                    new_document_ids=user_data.get("document_ids", []),
+                    existing_document_ids=[],
+                )
+            
+            self._save_user_data(user.user_id, user_data)
 
     def _merge_document_ids(
         self,
@@ -112,45 +265,41 @@ class UserStorage:
         2. 补充当前内存中的票据ID（可能尚未写入目录）
         3. 补充已有用户数据中仍存在的票据ID
         """
-        merged_ids: List[str] = []
-        seen: set[str] = set()
-        
-        def add_doc_id(doc_id: str) -> None:
-            if doc_id and doc_id not in seen:
-                merged_ids.append(doc_id)
-                seen.add(doc_id)
-        
         # 票据目录中的文件代表系统真实存在的票据
         user_docs_dir = self.get_user_documents_dir(user_id)
         doc_files = []
         try:
-            for path in user_docs_dir.glob("*.json"):
-                try:
-                    mtime = path.stat().st_mtime
-                except OSError:
-                    mtime = 0.0
-                doc_files.append((mtime, path.stem))
+            # scandir 一次遍历即可拿到文件名和（已缓存的）stat 信息
+            with os.scandir(user_docs_dir) as entries:
+                for entry in entries:
+                    if not entry.name.endswith(".json") or not entry.is_file():
+                        continue
+                    try:
+                        mtime_ns = entry.stat().st_mtime_ns
+                    except OSError:
+                        mtime_ns = 0
+                    doc_files.append((mtime_ns, entry.name[:-5]))
         except FileNotFoundError:
             doc_files = []
         
-        doc_files.sort(key=lambda item: item[0])
+        # 整数纳秒时间戳比较更快且无精度损失，时间相同时按票据ID排序保证稳定
+        doc_files.sort()
         dir_doc_ids = [doc_id for _, doc_id in doc_files]
         
-        for doc_id in dir_doc_ids:
-            add_doc_id(doc_id)
-        
-        # 当前内存中的票据ID
-        for doc_id in new_document_ids:
-            add_doc_id(doc_id)
-        
         # 历史用户数据中的票据ID，仅保留仍存在于目录或当前列表的部分
         current_set = set(new_document_ids)
         dir_set = set(dir_doc_ids)
-        for doc_id in existing_document_ids:
-            if doc_id in current_set or doc_id in dir_set:
-                add_doc_id(doc_id)
-        
-        return merged_ids
+        kept_existing_ids = (
+            doc_id for doc_id in existing_document_ids
+            if doc_id in current_set or doc_id in dir_set
+        )
+        
+        # dict.fromkeys 按首次出现的顺序去重；filter 去掉空ID
+        return list(dict.fromkeys(filter(None, chain(
+            dir_doc_ids,
+            new_document_ids,
+            kept_existing_ids,
+        ))))
     
     def load_user(self, user_id: str) -> Optional[User]:
         """从JSON加载用户
@@ -161,8 +310,7 @@ class UserStorage:
         Returns:
             用户对象，如果不存在返回None
         """
-        all_users = self._load_all_users()
-        user_data = all_users.get(user_id)
+        user_data = self._load_user_data(user_id)
         
         if not user_data:
             return None
@@ -178,8 +326,7 @@ class UserStorage:
         Returns:
             True如果用户存在
         """
-        all_users = self._load_all_users()
-        return user_id in all_users
+        return self._user_path(user_id).is_file()
     
     def delete_user(self, user_id: str) -> bool:
         """删除用户及其所有数据
@@ -190,19 +337,22 @@ class UserStorage:
         Returns:
             True如果删除成功
         """
-        all_users = self._load_all_users()
-        
-        if user_id not in all_users:
-            return False
-        
-        del all_users[user_id]
-        self._save_all_users(all_users)
+        with self._lock:
+            self._users_cache.pop(user_id, None)
+            try:
+                self._user_path(user_id).unlink()
+            except FileNotFoundError:
+                return False
         
-        # 删除用户上传文件目录
+        # 删除用户上传文件目录：先改名移出原路径，再交给后台线程删除，不阻塞调用方
         user_upload_dir = self.uploads_dir / user_id
         if user_upload_dir.exists():
-            import shutil
-            shutil.rmtree(user_upload_dir)
+            trash_dir = self.uploads_dir / f".{user_id}.deleted.{uuid4().hex}"
+            try:
+                os.replace(user_upload_dir, trash_dir)
+            except OSError:
+                trash_dir = user_upload_dir
+            _get_cleanup_pool().submit(shutil.rmtree, trash_dir, ignore_errors=True)
         
         return True
     
@@ -216,14 +366,15 @@ class UserStorage:
         Returns:
             用户对象
         """
-        user = self.load_user(user_id)
-        if user:
+        with self._lock:
+            user_data = self._load_user_data(user_id)
+            if user_data:
+                return from_dict(user_data, User)
+            
+            # 创建新用户
+            user = create_new_user(user_id, profile_items)
+            self.save_user(user)
             return user
-        
-        # 创建新用户
-        user = create_new_user(user_id, profile_items)
-        self.save_user(user)
-        return user
     
     def list_all_users(self) -> List[str]:
         """列出所有用户ID
@@ -231,8 +382,30 @@ class UserStorage:
         Returns:
             用户ID列表
         """
-        all_users = self._load_all_users()
-        return list(all_users.keys())
+        return list(self.iter_all_users())
+    
+    def iter_all_users(self) -> Iterator[str]:
+        """逐个返回用户ID，只需遍历时无需构建完整列表
+        
+        Returns:
+            用户ID迭代器
+        """
+        with os.scandir(self.users_dir) as entries:
+            for entry in entries:
+                if not entry.name.endswith(".json"):
+                    continue
+                name = entry.name[:-5]
+                if not name.startswith(_HASHED_USER_PREFIX):
+                    yield unquote(name)
+                    continue
+                # 哈希文件名无法还原，从文件内容读取真实用户ID
+                try:
+                    with open(entry.path, "rb") as f:
+                        data = parse_json(f.read())
+                except (OSError, ValueError):
+                    continue
+                if isinstance(data, dict) and isinstance(data.get("user_id"), str):
+                    yield data["user_id"]
     
     def get_user_document_count(self, user_id: str) -> int:
         """获取用户票据数量
@@ -243,10 +416,10 @@ class UserStorage:
         Returns:
             票据数量
         """
-        user = self.load_user(user_id)
-        if not user:
+        user_data = self._load_user_data(user_id)
+        if not user_data:
             return 0
-        return len(user.document_ids)
+        return len(user_data.get("document_ids") or ())
     
     def get_user_documents_dir(self, user_id: str) -> Path:
         """获取用户文档存储目录
@@ -257,9 +430,20 @@ class UserStorage:
         Returns:
             用户文档目录路径
         """
-        user_docs_dir = self.documents_dir / user_id
-        user_docs_dir.mkdir(parents=True, exist_ok=True)
-        return user_docs_dir
+        return self._ensure_dir(self.documents_dir / user_id)
+    
+    def _documents_dir_str(self, user_id: str) -> str:
+        """获取用户票据目录的字符串路径（目录已确保存在）"""
+        docs_dir = self._user_docs_dir_str.get(user_id)
+        if docs_dir is None:
+            docs_dir = os.fspath(self.get_user_documents_dir(user_id))
+            self._user_docs_dir_str[user_id] = docs_dir
+        return docs_dir
+    
+    def _forget_documents_dir(self, user_id: str) -> None:
+        """清除用户票据目录的“已确认存在”缓存"""
+        self._user_docs_dir_str.pop(user_id, None)
+        self._ensured_dirs.discard(self.documents_dir / user_id)
     
     def save_document(self, user_id: str, document: BaseDocument) -> None:
         """保存票据到JSON文件
@@ -268,12 +452,23 @@ class UserStorage:
             user_id: 用户ID
             document: 票据对象
         """
-        user_docs_dir = self.get_user_documents_dir(user_id)
-        doc_file = user_docs_dir / f"{document.document_id}.json"
-        
+        doc_name = document.document_id + ".json"
         doc_data = to_dict(document)
-        with doc_file.open("w", encoding="utf-8") as f:
-            json.dump(doc_data, f, cls=DocumentJSONEncoder, ensure_ascii=False, indent=2)
+        payload = to_json_bytes(doc_data, indent=self._indent)
+        with self._lock:
+            doc_file = os.path.join(self._documents_dir_str(user_id), doc_name)
+            try:
+                st = atomic_write_bytes(doc_file, payload)
+            except FileNotFoundError:
+                # 目录已被外部删除：丢弃缓存的目录状态，重新创建后重试一次
+                self._forget_documents_dir(user_id)
+                doc_file = os.path.join(self._documents_dir_str(user_id), doc_name)
+                st = atomic_write_bytes(doc_file, payload)
+            self._cache_document(
+                (user_id, document.document_id),
+                (st.st_ino, st.st_mtime_ns, st.st_size),
+                doc_data,
+            )
     
     def load_document(self, user_id: str, document_id: str) -> Optional[BaseDocument]:
         """从JSON文件加载票据
@@ -285,17 +480,41 @@ class UserStorage:
         Returns:
             票据对象，如果不存在返回None
         """
-        user_docs_dir = self.get_user_documents_dir(user_id)
-        doc_file = user_docs_dir / f"{document_id}.json"
-        
-        if not doc_file.exists():
-            return None
-        
-        with doc_file.open("r", encoding="utf-8") as f:
-            doc_data = json.load(f)
+        doc_file = os.path.join(self._documents_dir_str(user_id), document_id + ".json")
+        cache_key = (user_id, document_id)
         
+        with self._lock:
+            try:
+                st = os.stat(doc_file)
+            except FileNotFoundError:
+                self._doc_cache.pop(cache_key, None)
+                return None
+            file_key = (st.st_ino, st.st_mtime_ns, st.st_size)
+            
+            cached = self._doc_cache.get(cache_key)
+            if cached is not None and cached[0] == file_key:
+                self._doc_cache.move_to_end(cache_key)
+                doc_data = cached[1]
+            else:
+                with open(doc_file, "rb") as f:
+                    doc_data = parse_json(f.read())
+                self._cache_document(cache_key, file_key, doc_data)
+        
+        # 每次都重新构建对象，调用方修改返回的票据不会影响缓存
         return from_dict(doc_data, BaseDocument)
     
+    def _cache_document(
+        self,
+        cache_key: Tuple[str, str],
+        file_key: Tuple[int, int, int],
+        doc_data: Dict,
+    ) -> None:
+        """写入票据数据缓存，超出容量时淘汰最久未使用的条目（调用方需持有锁）"""
+        self._doc_cache[cache_key] = (file_key, doc_data)
+        self._doc_cache.move_to_end(cache_key)
+        while len(self._doc_cache) > DOCUMENT_CACHE_SIZE:
+            self._doc_cache.popitem(last=False)
+    
     def list_user_documents(self, user_id: str) -> List[str]:
         """列出用户的所有票据ID
         
@@ -309,12 +528,12 @@ class UserStorage:
         if not user_docs_dir.exists():
             return []
         
-        doc_ids = []
-        for doc_file in user_docs_dir.glob("*.json"):
-            doc_id = doc_file.stem
-            doc_ids.append(doc_id)
-        
-        return doc_ids
+        with os.scandir(user_docs_dir) as entries:
+            return [
+                entry.name[:-5]
+                for entry in entries
+                if entry.name.endswith(".json")
+            ]
 
 
 __all__ = ["UserStorage"]